@@ -0,0 +1,79 @@
+"""量測列表頁與詳情頁 HTML 解析：主程序逐頁解析 vs process pool 平行解析
+
+用法（於專案根目錄）：
+    uv run benchmarks/parse_bench.py --pages 200 --workers 4
+
+fixtures/ 內的頁面依 scraper.py 的 selector 與 books.json 的資料重建，
+結構與天瓏書店列表頁 / 商品頁相同，但不是原站的逐字副本。
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper import make_parse_pool, parse_detail, parse_page  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def load_fixtures(prefix: str) -> list[str]:
+    """讀取指定前綴的 fixture HTML"""
+    pages = []
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        if name.startswith(prefix) and name.endswith(".html"):
+            with open(os.path.join(FIXTURES_DIR, name), "r", encoding="utf-8") as f:
+                pages.append(f.read())
+    return pages
+
+
+def bench_serial(func, pages: list[str]) -> float:
+    start = time.perf_counter()
+    for html in pages:
+        func(html)
+    return time.perf_counter() - start
+
+
+def bench_pool(func, pages: list[str], workers: int) -> float:
+    """含 process 啟動與 pickling 成本"""
+    start = time.perf_counter()
+    with make_parse_pool(workers) as pool:
+        futures = [pool.submit(func, html) for html in pages]
+        for future in futures:
+            future.result()
+    return time.perf_counter() - start
+
+
+def positive_int(value: str) -> int:
+    """argparse 用：限定 >= 1 的整數"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("必須 >= 1")
+    return number
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML 解析效能量測")
+    parser.add_argument("--pages", type=positive_int, default=200, help="解析頁數（fixture 重複使用）")
+    parser.add_argument("--workers", type=positive_int, default=os.cpu_count() or 1, help="process pool 大小")
+    args = parser.parse_args()
+
+    print(f"CPU: {os.cpu_count()}，頁數: {args.pages}，workers: {args.workers}")
+    for label, prefix, func in (
+        ("列表頁", "recent_", parse_page),
+        ("詳情頁", "product_", parse_detail),
+    ):
+        fixtures = load_fixtures(prefix)
+        pages = [fixtures[i % len(fixtures)] for i in range(args.pages)]
+        serial = bench_serial(func, pages)
+        pooled = bench_pool(func, pages, args.workers)
+        print(
+            f"{label}: 主程序 {serial:.2f}s ({serial / args.pages * 1000:.1f} ms/頁)，"
+            f"pool {pooled:.2f}s，加速 {serial / pooled:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
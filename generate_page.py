@@ -140,6 +140,12 @@ TEMPLATE = """\
     margin-bottom: 0.4rem;
     align-self: flex-start;
   }
+  .card-editions {
+    padding: 0 0.8rem 0.8rem;
+    font-size: 0.78rem;
+    color: #888;
+  }
+  .card-editions a { color: #3498db; text-decoration: none; }
   .badge-new {
     position: absolute;
     top: 8px;
@@ -211,6 +217,14 @@ TEMPLATE = """\
           </div>
         </div>
       </a>
+      {% if book.editions %}
+      <div class="card-editions">
+        其他版本:
+        {% for ed in book.editions %}
+        <a href="{{ ed.url }}" target="_blank" rel="noopener">{{ ed.title }}</a>{% if not loop.last %}、{% endif %}
+        {% endfor %}
+      </div>
+      {% endif %}
     </div>
     {% endfor %}
   </div>
@@ -272,6 +286,10 @@ def main():
     books = filtered
     print(f"日期篩選: {total_before} → {len(books)} 本 (排除出版日 < {cutoff})")
 
+    # 同書其他版本併入代表書顯示（代表書被日期篩掉時保留原書）
+    shown = {b["url"] for b in books}
+    books = [b for b in books if b.get("edition_of") not in shown]
+
     # 計算新書數
     new_count = sum(1 for b in books if b.get("is_new"))
 
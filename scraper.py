@@ -5,7 +5,12 @@ import json
 import os
 import re
 import shutil
+import stat
+import tempfile
 import time
+import unicodedata
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import nullcontext
 
 import httpx
 from bs4 import BeautifulSoup
@@ -23,6 +28,28 @@ HEADERS = {
 
 BOOKS_FILE = "books.json"
 BOOKS_PREV_FILE = "books_previous.json"
+CHECKPOINT_FILE = "crawl_checkpoint.json"
+CHECKPOINT_INTERVAL = 10  # 每抓取幾本詳情寫一次 checkpoint
+# 各 stage 的 checkpoint 必要欄位與型別
+CHECKPOINT_FIELDS = {
+    "list": {"next_url": (str, type(None)), "page": int, "books": list},
+    "details": {"books": list, "done_urls": list},
+}
+
+# 商品頁 URL 形如 /products/9786264016254，路徑即 ISBN-13（或 ISBN-10）
+ISBN_RE = re.compile(r"/products/(\d{13}|\d{9}[\dXx])(?:[/?#]|$)")
+BRACKET_RE = re.compile(r"[(\[【〔「『]([^)\]】〕」』]*)[)\]】〕」』]")
+# 可忽略的括號附註（白名單）：(2026最新版)、(暢銷版)、【作者印刷簽名頁】、(附學科測驗卷)、(第十四版)、(2nd Edition)
+# 上/中/下、Vol. N、(葷食)/(素食)、(附錄) 與英文原文書名不在此列，保留在 key 中
+EDITION_NUM = r"[\d一二三四五六七八九十百]+"
+NOTE_RE = re.compile(
+    r"(最新|暢銷|熱銷|紀念|修訂|增訂|典藏|新)版|簽名|附贈"
+    r"|^附(學科|術科|光碟|衝刺|測驗|解答|模擬|練習|範例|檔案|dvd|cd)"
+    rf"|^第?\s*{EDITION_NUM}\s*版$|^\d+/e$|edition",
+    re.IGNORECASE,
+)
+# 書名結尾的版次標記：, 4/e、第 3 版、第十四版
+EDITION_SUFFIX_RE = re.compile(rf"(,\s*\d+/e|第\s*{EDITION_NUM}\s*版)$", re.IGNORECASE)
 
 
 def parse_price(text: str) -> str | None:
@@ -35,11 +62,126 @@ def parse_price(text: str) -> str | None:
     return None
 
 
-def scrape_page(client: httpx.Client, url: str) -> tuple[list[dict], str | None]:
-    """爬取單頁書籍資料，回傳 (書籍列表, 下一頁URL或None)"""
-    resp = client.get(url)
-    resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "lxml")
+def parse_isbn(url: str) -> str | None:
+    """從商品頁 URL 取出 ISBN"""
+    match = ISBN_RE.search(url)
+    if match:
+        return match.group(1).upper()
+    return None
+
+
+def normalize_title(title: str) -> str:
+    """正規化書名作為版本比對用的 key：全形轉半形、去除版本附註、忽略大小寫與空白
+
+    >>> normalize_title("丙級冷凍空調技能檢定學術科題庫解析 (2026最新版)(附學科測驗卷)")
+    '丙級冷凍空調技能檢定學術科題庫解析'
+    >>> normalize_title("行銷學 － 觀光、休閒、餐旅服務業專案特色, 4/e")
+    '行銷學-觀光、休閒、餐旅服務業專案特色'
+    >>> normalize_title("民法概要 (第十四版)") == normalize_title("民法概要 第 13 版")
+    True
+    >>> normalize_title("Ｐｙｔｈｏｎ　程式設計【作者印刷簽名頁】(超值附贈大海報)")
+    'python程式設計'
+    >>> normalize_title("資料結構 (附錄)") == normalize_title("資料結構")
+    False
+    >>> normalize_title("Python 程式設計 (上)") == normalize_title("Python 程式設計 (下)")
+    False
+    >>> normalize_title("丙級中餐烹調(葷食)技能檢定") == normalize_title("丙級中餐烹調(素食)技能檢定")
+    False
+    >>> normalize_title("深度學習 (Deep Learning)") == normalize_title("深度學習 (Grokking Deep Learning)")
+    False
+    >>> normalize_title("Deep Learning 實戰 [Vol. 1]")
+    'deeplearning實戰[vol.1]'
+    >>> normalize_title("【套書】"), normalize_title("「Python」")
+    ('【套書】', '「python」')
+    >>> normalize_title("(最新版)")
+    ''
+    """
+    text = unicodedata.normalize("NFKC", title).lower()
+    text = BRACKET_RE.sub(lambda m: "" if NOTE_RE.search(m.group(1)) else m.group(0), text)
+    text = re.sub(r"\s+", "", text)
+    return EDITION_SUFFIX_RE.sub("", text)
+
+
+def file_mode(path: str) -> int:
+    """既有檔案沿用原權限，新檔案依 umask 決定（與 open() 建立的檔案相同）"""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def write_json_atomic(path: str, data) -> None:
+    """先寫入同目錄暫存檔再 rename，避免中斷時留下寫一半的 JSON"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp 建立的暫存檔為 0600，rename 前改回一般檔案權限
+        os.chmod(tmp_path, file_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_checkpoint() -> dict | None:
+    """讀取上次中斷時留下的 checkpoint，不存在、損毀或格式不符時回傳 None"""
+    if not os.path.exists(CHECKPOINT_FILE):
+        return None
+    try:
+        with open(CHECKPOINT_FILE, "r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):  # 讀取失敗、編碼錯誤、JSON 損毀
+        return None
+
+    if not isinstance(checkpoint, dict):
+        return None
+    fields = CHECKPOINT_FIELDS.get(checkpoint.get("stage"))
+    if fields is None:
+        return None
+    for key, types in fields.items():
+        if not isinstance(checkpoint.get(key), types):
+            return None
+    # 後續流程會直接讀取 book["url"] / book["title"]
+    for book in checkpoint["books"]:
+        if not isinstance(book, dict):
+            return None
+        if not isinstance(book.get("url"), str) or not isinstance(book.get("title"), str):
+            return None
+    if not all(isinstance(url, str) for url in checkpoint.get("done_urls", [])):
+        return None
+    return checkpoint
+
+
+def save_checkpoint(state: dict) -> None:
+    """寫入爬取進度（stage / 下一頁 URL / 已取得書籍 / 已完成詳情）"""
+    write_json_atomic(CHECKPOINT_FILE, state)
+
+
+def clear_checkpoint() -> None:
+    """爬取完成後移除 checkpoint"""
+    if os.path.exists(CHECKPOINT_FILE):
+        os.remove(CHECKPOINT_FILE)
+
+
+def make_parse_pool(workers: int) -> ProcessPoolExecutor | nullcontext:
+    """建立 HTML 解析用的 process pool；workers <= 0 時回傳空的 context（主程序解析）"""
+    if workers <= 0:
+        return nullcontext()
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def parse_page(html: str) -> tuple[list[dict], str | None]:
+    """解析列表頁 HTML，回傳 (書籍列表, 下一頁URL或None)
+
+    只依賴 HTML 字串並回傳純 dict，可直接丟到 ProcessPoolExecutor 執行。
+    """
+    soup = BeautifulSoup(html, "lxml")
 
     books = []
     for li in soup.select("li.single-book"):
@@ -79,6 +221,7 @@ def scrape_page(client: httpx.Client, url: str) -> tuple[list[dict], str | None]
             {
                 "title": title,
                 "url": book_url,
+                "isbn": parse_isbn(book_url),
                 "image": image,
                 "original_price": original_price,
                 "sale_price": sale_price,
@@ -99,72 +242,106 @@ def scrape_page(client: httpx.Client, url: str) -> tuple[list[dict], str | None]
     return books, next_url
 
 
-def scrape_detail(client: httpx.Client, book_url: str) -> dict:
-    """抓取書籍詳情頁，回傳 author/publisher/date_published/description/categories"""
+def scrape_page(client: httpx.Client, url: str) -> tuple[list[dict], str | None]:
+    """爬取單頁書籍資料，回傳 (書籍列表, 下一頁URL或None)"""
+    resp = client.get(url)
+    resp.raise_for_status()
+    return parse_page(resp.text)
+
+
+def parse_detail(html: str) -> dict:
+    """解析詳情頁 HTML，回傳 author/publisher/date_published/description/categories"""
     detail = {}
+    soup = BeautifulSoup(html, "lxml")
+
+    # JSON-LD：author, publisher, date_published
+    ld_script = soup.select_one("script[type='application/ld+json']")
+    if ld_script:
+        try:
+            ld = json.loads(ld_script.string)
+            # author 可能是 list 或 dict
+            author_raw = ld.get("author")
+            if isinstance(author_raw, list):
+                detail["author"] = ", ".join(
+                    a.get("name", "") for a in author_raw if isinstance(a, dict)
+                )
+            elif isinstance(author_raw, dict):
+                detail["author"] = author_raw.get("name", "")
+
+            pub_raw = ld.get("publisher")
+            if isinstance(pub_raw, dict):
+                detail["publisher"] = pub_raw.get("name", "")
+
+            detail["date_published"] = ld.get("datePublished", "")
+        except (json.JSONDecodeError, TypeError):
+            pass
+
+    # description：從 og:description meta 取 | 前的部分
+    og_desc = soup.select_one("meta[property='og:description']")
+    if og_desc:
+        desc_text = og_desc.get("content", "")
+        if "|" in desc_text:
+            desc_text = desc_text.split("|")[0].strip()
+        detail["description"] = desc_text
+
+    # categories：從 keywords meta + category links
+    categories = set()
+    kw_meta = soup.select_one("meta[name='keywords']")
+    if kw_meta:
+        kw_text = kw_meta.get("content", "")
+        for kw in kw_text.split(","):
+            kw = kw.strip()
+            if kw:
+                categories.add(kw)
+
+    for cat_a in soup.select("a[href^='/categories/']"):
+        cat_text = cat_a.get_text(strip=True)
+        if cat_text:
+            categories.add(cat_text)
+
+    detail["categories"] = sorted(categories)
+
+    return detail
+
+
+def fetch_html(client: httpx.Client, book_url: str) -> str | None:
+    """抓取詳情頁 HTML，失敗時印出警告並回傳 None"""
     try:
         resp = client.get(book_url)
         resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "lxml")
+        return resp.text
+    except Exception as e:
+        print(f"  ⚠ 抓取詳情失敗: {book_url} ({e})")
+        return None
 
-        # JSON-LD：author, publisher, date_published
-        ld_script = soup.select_one("script[type='application/ld+json']")
-        if ld_script:
-            try:
-                ld = json.loads(ld_script.string)
-                # author 可能是 list 或 dict
-                author_raw = ld.get("author")
-                if isinstance(author_raw, list):
-                    detail["author"] = ", ".join(
-                        a.get("name", "") for a in author_raw if isinstance(a, dict)
-                    )
-                elif isinstance(author_raw, dict):
-                    detail["author"] = author_raw.get("name", "")
-
-                pub_raw = ld.get("publisher")
-                if isinstance(pub_raw, dict):
-                    detail["publisher"] = pub_raw.get("name", "")
-
-                detail["date_published"] = ld.get("datePublished", "")
-            except (json.JSONDecodeError, TypeError):
-                pass
-
-        # description：從 og:description meta 取 | 前的部分
-        og_desc = soup.select_one("meta[property='og:description']")
-        if og_desc:
-            desc_text = og_desc.get("content", "")
-            if "|" in desc_text:
-                desc_text = desc_text.split("|")[0].strip()
-            detail["description"] = desc_text
-
-        # categories：從 keywords meta + category links
-        categories = set()
-        kw_meta = soup.select_one("meta[name='keywords']")
-        if kw_meta:
-            kw_text = kw_meta.get("content", "")
-            for kw in kw_text.split(","):
-                kw = kw.strip()
-                if kw:
-                    categories.add(kw)
-
-        for cat_a in soup.select("a[href^='/categories/']"):
-            cat_text = cat_a.get_text(strip=True)
-            if cat_text:
-                categories.add(cat_text)
-
-        detail["categories"] = sorted(categories)
 
+def scrape_detail(client: httpx.Client, book_url: str) -> dict:
+    """抓取書籍詳情頁，回傳 author/publisher/date_published/description/categories"""
+    html = fetch_html(client, book_url)
+    if html is None:
+        return {}
+    try:
+        return parse_detail(html)
     except Exception as e:
-        print(f"  ⚠ 抓取詳情失敗: {book_url} ({e})")
+        print(f"  ⚠ 解析詳情失敗: {book_url} ({e})")
+        return {}
 
-    return detail
 
+def scrape_all(checkpoint: dict | None = None) -> list[dict]:
+    """爬取所有頁面的書籍資料
 
-def scrape_all() -> list[dict]:
-    """爬取所有頁面的書籍資料"""
-    all_books = []
-    url = START_URL
-    page = 1
+    列表頁一律在主程序解析：下一頁 URL 要解析完才知道，送進 process pool 也只能等結果，
+    無法與抓取重疊。每頁完成後寫入 checkpoint，傳入 checkpoint 時從中斷的頁面繼續。
+    """
+    if checkpoint:
+        all_books = checkpoint["books"]
+        url = checkpoint["next_url"]
+        page = checkpoint["page"]
+        print(f"從 checkpoint 繼續：已有 {len(all_books)} 本書，自第 {page} 頁開始")
+    else:
+        all_books = []
+        url = START_URL
+        page = 1
 
     with httpx.Client(headers=HEADERS, follow_redirects=True, timeout=30) as client:
         while url:
@@ -175,6 +352,7 @@ def scrape_all() -> list[dict]:
 
             url = next_url
             page += 1
+            save_checkpoint({"stage": "list", "next_url": url, "page": page, "books": all_books})
             if url:
                 time.sleep(1)  # 禮貌性延遲
 
@@ -207,9 +385,151 @@ def mark_new_books(books: list[dict], old_index: dict[str, dict]):
         book["is_new"] = book["url"] not in old_index
 
 
-def enrich_details(books: list[dict], old_index: dict[str, dict]):
-    """對每本書抓取詳情，已有詳情的書直接沿用快取"""
+def normalize_name(name: str) -> str:
+    """正規化出版社 / 作者名稱：全形轉半形、忽略大小寫與空白"""
+    return re.sub(r"\s+", "", unicodedata.normalize("NFKC", name).lower())
+
+
+def edition_keys(book: dict) -> list[str]:
+    """書籍在版本索引中的 key
+
+    ISBN 之外，正規化書名須搭配相同出版社或作者才算同一本書，
+    避免同名的不同書被合併；書名正規化後為空、或缺少出版社與作者時不加入書名 key。
+    """
+    keys = []
+    isbn = book.get("isbn") or parse_isbn(book["url"])
+    if isbn:
+        keys.append(f"isbn:{isbn}")
+    title_key = normalize_title(book.get("title", ""))
+    if title_key:
+        for field in ("publisher", "author"):
+            name = normalize_name(book.get(field) or "")
+            if name:
+                keys.append(f"title:{title_key}|{field}:{name}")
+    return keys
+
+
+def edition_entry(book: dict) -> dict:
+    """editions 列表中的單筆版本資料"""
+    return {
+        "title": book["title"],
+        "url": book["url"],
+        "isbn": book.get("isbn") or parse_isbn(book["url"]),
+        "sale_price": book.get("sale_price", ""),
+    }
+
+
+def group_editions(books: list[dict], old_books: list[dict] = ()):
+    """依 ISBN 與正規化書名（同出版社或作者）將同書的不同版本歸為一組
+
+    以 dict 索引一次掃描完成（O(n)）。索引先以上次的書單（old_books）預建，
+    上次的代表書與其 editions 會帶入本次同組的代表書，因此跨周的版本也能串起來。
+    每組以本次列表中第一本新書為代表（沒有新書時取第一本），其餘書籍標記 edition_of
+    指向代表書的 URL；代表書的 editions 列出其他版本，ISBN 相同的重複項目則直接合併、
+    不列入 editions。
+
+    >>> books = [
+    ...     {"title": "深度學習 (Deep Learning)", "url": "/products/9780000000001",
+    ...      "author": "A", "is_new": False},
+    ...     {"title": "深度學習 (Grokking Deep Learning)", "url": "/products/9780000000002",
+    ...      "author": "B", "is_new": True},
+    ...     {"title": "深度學習 (Deep Learning)", "url": "/products/9780000000003",
+    ...      "author": "C", "is_new": True},
+    ...     {"title": "深度學習 (Deep Learning) (2026最新版)", "url": "/products/9780000000004",
+    ...      "author": "A", "is_new": True},
+    ... ]
+    >>> group_editions(books)
+    版本合併：1 本併入其他版本，1 本附有其他版本連結
+    >>> [b.get("edition_of") for b in books]
+    ['/products/9780000000004', None, None, None]
+    >>> [e["url"] for e in books[3]["editions"]]
+    ['/products/9780000000001']
+    """
+    current_urls = {b["url"] for b in books}
+    index: dict[str, dict] = {}
+
+    # 以上次的書單預建索引：代表書建組，併入的書沿用代表書的組
+    groups_by_url: dict[str, dict] = {}
+    for old in old_books:
+        if old.get("edition_of"):
+            continue
+        history = [edition_entry(old)] + old.get("editions", [])
+        group = {
+            "primary": None,
+            "members": [],
+            "editions": [e for e in history if e["url"] not in current_urls],
+        }
+        groups_by_url[old["url"]] = group
+        for key in edition_keys(old):
+            index.setdefault(key, group)
+    for old in old_books:
+        group = groups_by_url.get(old.get("edition_of"))
+        if group:
+            for key in edition_keys(old):
+                index.setdefault(key, group)
+
+    def add_member(group: dict, book: dict):
+        """將書併入組內：標記 edition_of，ISBN 與代表書不同時列入 editions"""
+        primary = group["primary"]
+        book["edition_of"] = primary["url"]
+        book.pop("editions", None)
+        group["members"].append(book)
+        if not book["isbn"] or book["isbn"] != primary["isbn"]:
+            group["editions"].append(edition_entry(book))
+
+    def set_primary(group: dict, book: dict):
+        """設定代表書，並移除 editions 中與代表書相同的項目"""
+        group["primary"] = book
+        book.pop("edition_of", None)
+        group["editions"] = [
+            e
+            for e in group["editions"]
+            if e["url"] != book["url"] and not (book["isbn"] and e.get("isbn") == book["isbn"])
+        ]
+        book["editions"] = group["editions"]
+        for member in group["members"]:
+            member["edition_of"] = book["url"]
+
+    for book in books:
+        book.pop("edition_of", None)
+        book.pop("editions", None)
+        book["isbn"] = book.get("isbn") or parse_isbn(book["url"])
+        keys = edition_keys(book)
+
+        group = next((index[k] for k in keys if k in index), None)
+        if group is None:
+            group = {"primary": None, "members": [], "editions": []}
+        primary = group["primary"]
+        if primary is None:
+            set_primary(group, book)
+        elif book.get("is_new") and not primary.get("is_new"):
+            # 新版本排在已上架的舊版本之後時，改以新版本為代表，避免 NEW 標記與新書數被隱藏
+            set_primary(group, book)
+            add_member(group, primary)
+        else:
+            add_member(group, book)
+        for key in keys:
+            index.setdefault(key, group)
+
+    grouped = sum(1 for b in books if b.get("edition_of"))
+    linked = sum(1 for b in books if b.get("editions"))
+    if grouped or linked:
+        print(f"版本合併：{grouped} 本併入其他版本，{linked} 本附有其他版本連結")
+
+
+def enrich_details(
+    books: list[dict],
+    old_index: dict[str, dict],
+    parse_workers: int = 0,
+    done_urls: set[str] | None = None,
+):
+    """對每本書抓取詳情，已有詳情的書直接沿用快取
+
+    parse_workers > 0 時，詳情頁交由 process pool 解析，抓取下一本的同時解析前一本。
+    每 CHECKPOINT_INTERVAL 本寫入 checkpoint；done_urls 為上次中斷前已完成的詳情。
+    """
     detail_fields = ("author", "publisher", "date_published", "description", "categories")
+    done_urls = set() if done_urls is None else done_urls
     to_fetch = []
 
     for book in books:
@@ -219,7 +539,7 @@ def enrich_details(books: list[dict], old_index: dict[str, dict]):
             for field in detail_fields:
                 if field in old:
                     book[field] = old[field]
-        else:
+        elif book["url"] not in done_urls:
             to_fetch.append(book)
 
     if not to_fetch:
@@ -228,14 +548,41 @@ def enrich_details(books: list[dict], old_index: dict[str, dict]):
 
     print(f"\n需抓取 {len(to_fetch)} 本書的詳情（{len(books) - len(to_fetch)} 本已快取）")
 
-    with httpx.Client(headers=HEADERS, follow_redirects=True, timeout=30) as client:
+    pending: list[tuple[dict, Future]] = []
+
+    def flush():
+        """收齊已送出的解析結果並寫入 checkpoint"""
+        for book, future in pending:
+            try:
+                book.update(future.result())
+                done_urls.add(book["url"])
+            except Exception as e:
+                print(f"  ⚠ 解析詳情失敗: {book['url']} ({e})")
+        pending.clear()
+        save_checkpoint({"stage": "details", "books": books, "done_urls": sorted(done_urls)})
+
+    with (
+        httpx.Client(headers=HEADERS, follow_redirects=True, timeout=30) as client,
+        make_parse_pool(parse_workers) as pool,
+    ):
         for i, book in enumerate(to_fetch, 1):
             print(f"  [{i}/{len(to_fetch)}] 抓取詳情: {book['title'][:40]}...")
-            detail = scrape_detail(client, book["url"])
-            book.update(detail)
+            if pool is None:
+                detail = scrape_detail(client, book["url"])
+                book.update(detail)
+                if detail:
+                    done_urls.add(book["url"])
+            else:
+                html = fetch_html(client, book["url"])
+                if html is not None:
+                    pending.append((book, pool.submit(parse_detail, html)))
+            if i % CHECKPOINT_INTERVAL == 0:
+                flush()
             if i < len(to_fetch):
                 time.sleep(1)
 
+        flush()
+
 
 def main():
     parser = argparse.ArgumentParser(description="天瓏書店新書爬蟲")
@@ -244,17 +591,41 @@ def main():
         action="store_true",
         help="跳過詳情頁抓取（本地開發用）",
     )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=0,
+        metavar="N",
+        help="（實驗性）以 N 個 process 平行解析詳情頁 HTML（預設 0：在主程序解析）",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=f"從上次中斷的 {CHECKPOINT_FILE} 繼續爬取",
+    )
     args = parser.parse_args()
 
-    # 讀取舊資料 & 備份
+    checkpoint = load_checkpoint() if args.resume else None
+    if args.resume and checkpoint is None:
+        print(f"找不到可用的 {CHECKPOINT_FILE}（不存在或格式不符），改為完整爬取")
+
+    # 讀取舊資料 & 備份（續跑時 books.json 尚未被覆寫，備份已在上次完成）
     old_index = load_old_books()
-    backup_old_books()
+    if checkpoint is None:
+        backup_old_books()
+
+    if checkpoint and checkpoint.get("stage") == "details":
+        # 列表頁已爬完，直接進入詳情抓取
+        books = checkpoint["books"]
+        print(f"從 checkpoint 繼續：列表頁已完成，共 {len(books)} 本書")
+    else:
+        # 爬取列表頁
+        books = scrape_all(checkpoint)
 
-    # 爬取列表頁
-    books = scrape_all()
+        # 標記新書
+        mark_new_books(books, old_index)
+        save_checkpoint({"stage": "details", "books": books, "done_urls": []})
 
-    # 標記新書
-    mark_new_books(books, old_index)
     new_count = sum(1 for b in books if b.get("is_new"))
     print(f"其中 {new_count} 本為新書")
 
@@ -270,11 +641,15 @@ def main():
                     if field in old:
                         book[field] = old[field]
     else:
-        enrich_details(books, old_index)
+        done_urls = set(checkpoint.get("done_urls", [])) if checkpoint else set()
+        enrich_details(books, old_index, args.parse_workers, done_urls)
+
+    # 合併同書不同版本
+    group_editions(books, list(old_index.values()))
 
     # 寫入 JSON
-    with open(BOOKS_FILE, "w", encoding="utf-8") as f:
-        json.dump(books, f, ensure_ascii=False, indent=2)
+    write_json_atomic(BOOKS_FILE, books)
+    clear_checkpoint()
     print(f"已儲存至 {BOOKS_FILE}")
 
 
@@ -8,6 +8,13 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
 
+def filter_books(books: list[dict], cutoff: str) -> list[dict]:
+    """過濾 7 日內的書，並將同書其他版本併入代表書（代表書被篩掉時保留原書）"""
+    books = [b for b in books if not b.get("date_published") or b["date_published"] >= cutoff]
+    shown = {b["url"] for b in books}
+    return [b for b in books if b.get("edition_of") not in shown]
+
+
 def build_html(books: list[dict]) -> str:
     """產生 HTML 格式的 email 內容，風格與網頁一致"""
 
@@ -15,7 +22,7 @@ def build_html(books: list[dict]) -> str:
     tz = timezone(timedelta(hours=8))
     now = datetime.now(tz)
     cutoff = (now - timedelta(days=7)).strftime("%Y-%m-%d")
-    books = [b for b in books if not b.get("date_published") or b["date_published"] >= cutoff]
+    books = filter_books(books, cutoff)
 
     new_count = sum(1 for b in books if b.get("is_new"))
 
@@ -66,6 +73,15 @@ def build_html(books: list[dict]) -> str:
                 desc += "..."
             desc_html = f'<div style="font-size:12px;color:#666;margin-top:4px">{desc}</div>'
 
+        # 其他版本
+        editions_html = ""
+        if book.get("editions"):
+            links = "、".join(
+                f'<a href="{ed["url"]}" style="color:#3498db;text-decoration:none">{ed["title"]}</a>'
+                for ed in book["editions"]
+            )
+            editions_html = f'<div style="font-size:12px;color:#888;margin-top:4px">其他版本: {links}</div>'
+
         # badges 行
         badges = f"{new_badge}{discount_badge}"
         badges_html = f'<div style="margin-bottom:4px">{badges}</div>' if badges else ""
@@ -82,6 +98,7 @@ def build_html(books: list[dict]) -> str:
     </a>
     {meta_html}
     {desc_html}
+    {editions_html}
     <div style="margin-top:6px">{price_html}</div>
   </td>
 </tr>
@@ -129,7 +146,7 @@ def main():
     # 計算過濾後數量（與 build_html 相同邏輯）
     tz = timezone(timedelta(hours=8))
     cutoff = (datetime.now(tz) - timedelta(days=7)).strftime("%Y-%m-%d")
-    filtered = [b for b in books if not b.get("date_published") or b["date_published"] >= cutoff]
+    filtered = filter_books(books, cutoff)
 
     msg = MIMEMultipart("alternative")
     msg["Subject"] = f"天瓏書店新書通知 ({len(filtered)} 本)"